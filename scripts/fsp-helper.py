@@ -20,15 +20,191 @@ Usage:
   # All-in-one check
   fsp-helper.py check --lexer turtle_lexer.l --parser turtle_parser.y
 
+  # Check many lexer/parser pairs (one 'lexer.l,parser.y' per line)
+  fsp-helper.py batch --manifest grammars.txt -j 4
+
 (C) Copyright 2025 Dave Beckett https://www.dajobe.org/
 """
 
-import argparse
+import contextlib
+import functools
+import heapq
+import io
+import os
 import re
+import stat
+import string
 import sys
-from dataclasses import dataclass
+from array import array
 from enum import Enum
-from typing import List, Optional, TextIO, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    TextIO,
+    Tuple,
+)
+
+if TYPE_CHECKING:
+    import argparse
+
+# Patterns used on every rule / line are compiled once at import time
+_CHARCLASS_RE = re.compile(r"\[[^\]]+\]")
+# Plain keywords and short operators free of variable-length metacharacters
+_SIMPLE_PATTERN_RE = re.compile(r"(?P<keyword>[a-zA-Z0-9_]+)|(?P<operator>[=;:,()}\]<>!@#$%^&/|\\.-]{1,3})")
+_YY_INPUT_RE = re.compile(r"#\s*define\s+YY_INPUT")
+_API_DEFINE_RE = re.compile(r"%define\s+api\.([a-z\-\.]+)\s+(.+)")
+
+# Regex metacharacters that may make a Flex pattern variable-length
+_VARIABLE_CHARS = frozenset("*+?{[")
+_REPETITION_CHARS = frozenset("*+")
+_OPERATOR_CHARS = frozenset("=;:,(){}[]<>!@#$%^&*+-/|\\.")
+
+
+# ========================================================================
+# SOURCE: Reading lexer/parser files once for several consumers
+# ========================================================================
+
+
+def _read_source(filename: str) -> bytes:
+    """Read a lexer or parser file so it can be shared between commands."""
+    with open(filename, "rb") as f:
+        return f.read()
+
+
+def _open_binary(filename: str, source: Optional[bytes] = None) -> BinaryIO:
+    """Open filename in binary mode, or wrap already-read source bytes."""
+    if source is None:
+        return open(filename, "rb")
+    return io.BytesIO(source)
+
+
+def _open_text(filename: str, source: Optional[bytes] = None) -> TextIO:
+    """Open filename in text mode, or wrap already-read source bytes the same way."""
+    if source is None:
+        return open(filename, "r")
+    return io.TextIOWrapper(io.BytesIO(source))
+
+
+# ========================================================================
+# CACHE: Reusing results for unchanged lexer/parser files
+# ========================================================================
+
+# Bump when the layout of cached values changes
+_CACHE_VERSION = 1
+
+# Most entries kept; the least recently written are dropped first
+_CACHE_MAX_ENTRIES = 256
+
+
+@functools.lru_cache(maxsize=None)
+def _tool_stamp() -> Tuple[int, ...]:
+    """Return the part of every cache stamp that identifies this version of the tool."""
+    try:
+        st = os.stat(__file__)
+    except OSError:
+        return (_CACHE_VERSION,)
+    return (st.st_mtime_ns, st.st_size, _CACHE_VERSION)
+
+
+class ResultCache:
+    """
+    On-disk cache of per-file results.
+
+    Entries are keyed by result kind and absolute path, and are only
+    valid while the file's mtime and size, this script's own mtime and
+    size, and _CACHE_VERSION match the stamp recorded with them, so
+    editing the analysis invalidates every entry. On save, entries for
+    files that no longer exist are pruned and at most _CACHE_MAX_ENTRIES
+    are kept.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+            path = os.path.join(cache_home, "libfsp-helper", "results.json")
+        self.path = path
+        self.entries: Dict[str, Any] = {}
+        self.dirty = False
+
+        # Only commands that use the cache pay for importing json
+        import json
+
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self.entries = data
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def stamp(filename: str) -> Optional[List[int]]:
+        """Return the validity stamp for filename, or None if it cannot be stat-ed."""
+        try:
+            st = os.stat(filename)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size, *_tool_stamp()]
+
+    def get(self, kind: str, filename: str, stamp: List[int]) -> Any:
+        """Return the cached value for filename if its stamp still matches, else None."""
+        entry = self.entries.get(f"{kind}:{os.path.abspath(filename)}")
+        if not isinstance(entry, dict) or entry.get("stamp") != stamp:
+            return None
+        return entry.get("value")
+
+    def put(self, kind: str, filename: str, stamp: List[int], value: Any) -> None:
+        """Record value for filename as of stamp."""
+        key = f"{kind}:{os.path.abspath(filename)}"
+        # Re-insert so entries stay ordered from least to most recently written
+        self.entries.pop(key, None)
+        self.entries[key] = {"stamp": stamp, "value": value}
+        self.dirty = True
+
+    def _prune(self) -> None:
+        """Drop entries for files that no longer exist, then the oldest beyond the cap."""
+        live = {}
+        for key, entry in self.entries.items():
+            _, _, filename = key.partition(":")
+            if os.path.exists(filename):
+                live[key] = entry
+        keys = list(live)
+        for key in keys[: max(0, len(keys) - _CACHE_MAX_ENTRIES)]:
+            del live[key]
+        self.entries = live
+
+    def save(self) -> None:
+        """Atomically write the cache back to disk if anything changed."""
+        if not self.dirty:
+            return
+
+        import json
+        import tempfile
+
+        self._prune()
+        directory = os.path.dirname(self.path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".results-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(self.entries, f)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            # A cache that cannot be written is not an error
+            pass
+        self.dirty = False
 
 
 # ========================================================================
@@ -36,12 +212,13 @@ from typing import List, Optional, TextIO, Tuple
 # ========================================================================
 
 
-def extract_rules_from_flex(filename: str) -> List[Tuple[str, str]]:
+def extract_rules_from_flex(filename: str, source: Optional[bytes] = None) -> List[Tuple[str, str]]:
     """
     Extract token rules from Flex lexer file.
 
     Args:
         filename: Path to .l file
+        source: Contents of filename if already read
 
     Returns:
         List of (pattern, action) tuples
@@ -52,16 +229,19 @@ def extract_rules_from_flex(filename: str) -> List[Tuple[str, str]]:
     current_pattern = ""
     brace_count = 0
 
-    with open(filename, "r") as f:
+    # Scan as bytes and decode only the extracted patterns, so action
+    # bodies and the C prologue/epilogue are never decoded
+    with _open_binary(filename, source) as f:
         for line in f:
             stripped = line.strip()
+            first = stripped[:1]
 
             # Skip comments
-            if stripped.startswith("/*") or stripped.startswith("//"):
+            if first == b"/" and stripped.startswith((b"/*", b"//")):
                 continue
 
             # Start of rules section (after second %%)
-            if stripped == "%%":
+            if stripped == b"%%":
                 if in_rules_section:
                     break  # End of rules section
                 in_rules_section = True
@@ -72,7 +252,7 @@ def extract_rules_from_flex(filename: str) -> List[Tuple[str, str]]:
 
             # Handle multi-line actions
             if in_multiline_action:
-                brace_count += line.count("{") - line.count("}")
+                brace_count += line.count(b"{") - line.count(b"}")
                 if brace_count <= 0:
                     in_multiline_action = False
                 continue
@@ -83,25 +263,31 @@ def extract_rules_from_flex(filename: str) -> List[Tuple[str, str]]:
 
             # Match rule: pattern followed by action
             # Pattern can be: keyword, regex, or start condition
-            if "{" in line:
+            head, brace, rest = line.partition(b"{")
+            if brace:
                 # Extract pattern before the action
-                pattern_part = line.split("{")[0].strip()
-                if pattern_part and not pattern_part.startswith("<"):
+                pattern_part = head.strip()
+                if pattern_part and not pattern_part.startswith(b"<"):
                     # Not a start condition line
-                    rules.append((pattern_part, "action"))
+                    rules.append((pattern_part.decode("utf-8", errors="replace"), "action"))
 
-                # Check if this starts a multi-line action
-                brace_count = line.count("{") - line.count("}")
+                # Check if this starts a multi-line action; the pattern
+                # part holds no '{' so only the action needs a full count
+                brace_count = 1 + rest.count(b"{") - rest.count(b"}") - head.count(b"}")
                 if brace_count > 0:
                     in_multiline_action = True
 
     return rules
 
 
+@functools.lru_cache(maxsize=4096)
 def analyze_flex_pattern(pattern: str) -> Tuple[Optional[int], str]:
     """
     Analyze a Flex pattern and determine if it's fixed or variable length.
 
+    Results are memoized since grammars often repeat the same pattern
+    under several start conditions.
+
     Args:
         pattern: Flex pattern (regex)
 
@@ -111,11 +297,22 @@ def analyze_flex_pattern(pattern: str) -> Tuple[Optional[int], str]:
     # Remove leading/trailing whitespace and quotes
     pattern = pattern.strip().strip('"')
 
+    # Fast path: most rules are plain keywords or operators
+    simple = _SIMPLE_PATTERN_RE.fullmatch(pattern)
+    if simple:
+        if simple.lastgroup == "keyword":
+            return len(pattern), f'keyword "{pattern}"'
+        return len(pattern), f'operator "{pattern}"'
+
+    # Bracket counts are shared by the checks below
+    open_brackets = pattern.count("[")
+    balanced = open_brackets == pattern.count("]")
+
     # Variable-length indicators
-    if any(op in pattern for op in ["*", "+", "?", "{", "["]):
-        if pattern.count("[") == pattern.count("]"):
+    if not _VARIABLE_CHARS.isdisjoint(pattern):
+        if balanced:
             # Character class - could be fixed
-            if "+" in pattern or "*" in pattern:
+            if not _REPETITION_CHARS.isdisjoint(pattern):
                 return None, "variable repetition"
         else:
             return None, "regex with repetition"
@@ -126,48 +323,52 @@ def analyze_flex_pattern(pattern: str) -> Tuple[Optional[int], str]:
         return len(content), f'literal "{content}"'
 
     # Case-insensitive patterns like [Pp][Rr][Ii][Nn][Tt]
-    if pattern.count("[") > 0 and pattern.count("[") == pattern.count("]"):
+    if open_brackets > 0 and balanced:
         # Count character classes
-        char_classes = re.findall(r"\[[^\]]+\]", pattern)
+        char_classes = _CHARCLASS_RE.findall(pattern)
         if all(len(cc) <= 10 for cc in char_classes):  # Reasonable char class
             length = len(char_classes)
             return length, f"pattern requires ~{length} chars"
 
-    # Simple literal (letters/digits only)
-    if re.match(r"^[a-zA-Z0-9_]+$", pattern):
-        return len(pattern), f'keyword "{pattern}"'
-
     # Operators and punctuation
-    if len(pattern) <= 3 and all(c in "=;:,(){}[]<>!@#$%^&*+-/|\\." for c in pattern):
+    if len(pattern) <= 3 and _OPERATOR_CHARS.issuperset(pattern):
         return len(pattern), f'operator "{pattern}"'
 
     # Assume variable if we can't determine
     return None, "complex pattern"
 
 
-def calculate_min_buffer(filename: str, verbose: bool = False, quiet: bool = False) -> int:
+def calculate_min_buffer(
+    filename: str, verbose: bool = False, quiet: bool = False, source: Optional[bytes] = None
+) -> int:
     """
     Calculate optimal MIN_BUFFER_FOR_LEX value.
 
     Args:
         filename: Path to lexer .l file
         verbose: Show detailed analysis
-        quiet: Only output the number
+        quiet: Print nothing; the caller reports the returned value
+        source: Contents of filename if already read
 
     Returns:
         Recommended MIN_BUFFER_FOR_LEX value
     """
-    rules = extract_rules_from_flex(filename)
+    rules = extract_rules_from_flex(filename, source=source)
 
-    fixed_patterns = []
-    variable_patterns = []
+    # Fixed-length patterns kept as parallel arrays indexed together
+    fixed_lengths = array("i")
+    fixed_patterns: List[str] = []
+    fixed_descriptions: List[str] = []
+    variable_count = 0
 
     for pattern, _ in rules:
         length, description = analyze_flex_pattern(pattern)
         if length is not None:
-            fixed_patterns.append((pattern, length, description))
+            fixed_lengths.append(length)
+            fixed_patterns.append(pattern)
+            fixed_descriptions.append(description)
         else:
-            variable_patterns.append((pattern, description))
+            variable_count += 1
 
     if not fixed_patterns:
         if not quiet:
@@ -176,29 +377,26 @@ def calculate_min_buffer(filename: str, verbose: bool = False, quiet: bool = Fal
         return 64
 
     # Find longest fixed-length pattern
-    longest = max(fixed_patterns, key=lambda x: x[1])
-    max_length = longest[1]
+    longest = max(range(len(fixed_lengths)), key=fixed_lengths.__getitem__)
+    max_length = fixed_lengths[longest]
 
     # Recommend with 2x headroom
     recommended = max_length * 2
     # Round up to power of 2 for clean values
-    import math
-
-    recommended = 2 ** math.ceil(math.log2(recommended))
+    recommended = 1 << (recommended - 1).bit_length()
 
     if quiet:
-        print(recommended)
         return recommended
 
     print(f"Analyzing {filename}...")
     print("=" * 70)
     print(f"Fixed-length patterns found: {len(fixed_patterns)}")
-    print(f"Variable-length patterns: {len(variable_patterns)}")
+    print(f"Variable-length patterns: {variable_count}")
     print()
     print("Longest fixed-length token:")
-    print(f"  Pattern: {longest[0]}")
-    print(f"  Length:  {longest[1]} bytes")
-    print(f"  Description: {longest[2]}")
+    print(f"  Pattern: {fixed_patterns[longest]}")
+    print(f"  Length:  {max_length} bytes")
+    print(f"  Description: {fixed_descriptions[longest]}")
     print()
     print("Recommended MIN_BUFFER_FOR_LEX:")
     print(f"  Minimum safe: {max_length} bytes (exact)")
@@ -209,8 +407,8 @@ def calculate_min_buffer(filename: str, verbose: bool = False, quiet: bool = Fal
     if verbose:
         print()
         print("All fixed-length patterns:")
-        for pat, length, desc in sorted(fixed_patterns, key=lambda x: x[1], reverse=True)[:10]:
-            print(f"  {length:3d} bytes: {pat:30s} ({desc})")
+        for i in heapq.nlargest(10, range(len(fixed_lengths)), key=fixed_lengths.__getitem__):
+            print(f"  {fixed_lengths[i]:3d} bytes: {fixed_patterns[i]:30s} ({fixed_descriptions[i]})")
 
     return recommended
 
@@ -220,45 +418,27 @@ def calculate_min_buffer(filename: str, verbose: bool = False, quiet: bool = Fal
 # ========================================================================
 
 
-def generate_streaming_parser(
-    lexer_prefix: str,
-    parser_prefix: str,
-    min_buffer: int,
-    function_name: str,
-    output: TextIO,
-) -> None:
-    """
-    Generate a streaming parser implementation.
-
-    Args:
-        lexer_prefix: Prefix for lexer functions (e.g., 'turtle_lexer')
-        parser_prefix: Prefix for parser functions (e.g., 'turtle_parser')
-        min_buffer: MIN_BUFFER_FOR_LEX value
-        function_name: Name of the generated function
-        output: Output file handle
-    """
-    parser_upper = parser_prefix.upper()
-
-    output.write(
-        f"""/* Generated by fsp-helper.py from libfsp
+# Template for the generated C source; substituted by generate_streaming_parser()
+_STREAMING_PARSER_TEMPLATE = string.Template(
+    """/* Generated by fsp-helper.py from libfsp
  * https://github.com/dajobe/libfsp
  *
- * Lexer prefix: {lexer_prefix}
- * Parser prefix: {parser_prefix}
- * MIN_BUFFER_FOR_LEX: {min_buffer}
+ * Lexer prefix: ${lexer_prefix}
+ * Parser prefix: ${parser_prefix}
+ * MIN_BUFFER_FOR_LEX: ${min_buffer}
  */
 
 #include <stddef.h>
 #include <string.h>
 #include "fsp.h"
-#include "{lexer_prefix}.h"
-#include "{parser_prefix}.h"
+#include "${lexer_prefix}.h"
+#include "${parser_prefix}.h"
 
 /* Minimum bytes to accumulate before calling lexer */
-#define MIN_BUFFER_FOR_LEX {min_buffer}
+#define MIN_BUFFER_FOR_LEX ${min_buffer}
 
 /**
- * {function_name}:
+ * ${function_name}:
  * @ctx: FSP context (must be already created via fsp_create())
  * @input: Input string to parse
  * @chunk_size: Size of chunks to process (can be 1 byte to any size)
@@ -270,10 +450,10 @@ def generate_streaming_parser(
  * Return value: 0 on success, -1 on error
  */
 int
-{function_name}(fsp_context *ctx, const char *input, size_t chunk_size, void *user_data)
-{{
+${function_name}(fsp_context *ctx, const char *input, size_t chunk_size, void *user_data)
+{
   yyscan_t scanner;
-  {parser_prefix}_pstate *pstate;
+  ${parser_prefix}_pstate *pstate;
   int status;
   size_t pos = 0;
   size_t input_len;
@@ -286,23 +466,23 @@ int
   input_len = strlen(input);
 
   /* Initialize lexer */
-  if({lexer_prefix}_lex_init(&scanner)) {{
+  if(${lexer_prefix}_lex_init(&scanner)) {
     return -1;
-  }}
+  }
 
   /* Set FSP context as extra data for lexer */
-  {lexer_prefix}_set_extra(ctx, scanner);
+  ${lexer_prefix}_set_extra(ctx, scanner);
 
   /* Store user data in FSP context if provided */
   if(user_data)
     fsp_set_user_data(ctx, user_data);
 
   /* Create push parser state */
-  pstate = {parser_prefix}_pstate_new();
-  if(!pstate) {{
-    {lexer_prefix}_lex_destroy(scanner);
+  pstate = ${parser_prefix}_pstate_new();
+  if(!pstate) {
+    ${lexer_prefix}_lex_destroy(scanner);
     return -1;
-  }}
+  }
 
   /* STREAMING STRATEGY:
    * Phase 1: Accumulate chunks until buffer has MIN_BUFFER_FOR_LEX bytes OR EOF
@@ -313,11 +493,11 @@ int
    *
    * See libfsp README.md "Streaming with Small Chunks" section for details.
    */
-  while(pos < input_len || final_drain) {{
+  while(pos < input_len || final_drain) {
     int is_eof;
 
     /* Phase 1: Accumulate chunks until buffer is sufficiently full */
-    while(pos < input_len && fsp_buffer_available(ctx) < MIN_BUFFER_FOR_LEX) {{
+    while(pos < input_len && fsp_buffer_available(ctx) < MIN_BUFFER_FOR_LEX) {
       size_t chunk;
 
       chunk = input_len - pos;
@@ -325,26 +505,26 @@ int
         chunk = chunk_size;
 
       /* Append chunk to FSP buffer */
-      if(fsp_buffer_append(ctx, input + pos, chunk) < 0) {{
+      if(fsp_buffer_append(ctx, input + pos, chunk) < 0) {
         result = -1;
         goto cleanup;
-      }}
+      }
 
       pos += chunk;
-    }}
+    }
 
     /* Check if we've reached end of input */
     is_eof = (pos >= input_len);
 
-    if(is_eof && !final_drain) {{
+    if(is_eof && !final_drain) {
       /* Signal EOF to FSP context - no more chunks coming */
       ctx->more_chunks_expected = 0;
       final_drain = 1;
-    }}
+    }
 
     /* Phase 2: Process tokens (only when buffer is full enough OR at EOF) */
-    while(fsp_buffer_available(ctx) > 0 || (is_eof && final_drain)) {{
-      {parser_upper}_STYPE lval;
+    while(fsp_buffer_available(ctx) > 0 || (is_eof && final_drain)) {
+      ${parser_upper}_STYPE lval;
       int token;
 
       /* Don't call lexer if buffer is low and more data is coming */
@@ -352,47 +532,75 @@ int
         break;  /* Get more chunks first */
 
       /* Get next token from lexer */
-      token = {lexer_prefix}_lex(&lval, scanner);
+      token = ${lexer_prefix}_lex(&lval, scanner);
 
-      if(token == 0) {{
+      if(token == 0) {
         /* No more tokens available */
-        if(!is_eof) {{
+        if(!is_eof) {
           /* Lexer needs more data but we have more chunks coming */
           break;
-        }}
+        }
         /* Real EOF - done draining */
         final_drain = 0;
         break;
-      }}
+      }
 
       /* Push token to parser */
-      status = {parser_prefix}_push_parse(pstate, token, &lval, ctx, scanner);
+      status = ${parser_prefix}_push_parse(pstate, token, &lval, ctx, scanner);
 
-      if(status != YYPUSH_MORE) {{
+      if(status != YYPUSH_MORE) {
         /* Parse complete or error */
         if(status != 0)
           result = -1;
         goto cleanup;
-      }}
-    }}
+      }
+    }
 
     /* Exit loop if we're done draining at EOF */
     if(!final_drain && is_eof)
       break;
-  }}
+  }
 
   /* Push final EOF to parser */
-  status = {parser_prefix}_push_parse(pstate, 0, NULL, ctx, scanner);
+  status = ${parser_prefix}_push_parse(pstate, 0, NULL, ctx, scanner);
   if(status != 0)
     result = -1;
 
 cleanup:
-  {parser_prefix}_pstate_delete(pstate);
-  {lexer_prefix}_lex_destroy(scanner);
+  ${parser_prefix}_pstate_delete(pstate);
+  ${lexer_prefix}_lex_destroy(scanner);
 
   return result;
-}}
+}
 """
+)
+
+
+def generate_streaming_parser(
+    lexer_prefix: str,
+    parser_prefix: str,
+    min_buffer: int,
+    function_name: str,
+    output: TextIO,
+) -> None:
+    """
+    Generate a streaming parser implementation.
+
+    Args:
+        lexer_prefix: Prefix for lexer functions (e.g., 'turtle_lexer')
+        parser_prefix: Prefix for parser functions (e.g., 'turtle_parser')
+        min_buffer: MIN_BUFFER_FOR_LEX value
+        function_name: Name of the generated function
+        output: Output file handle
+    """
+    output.write(
+        _STREAMING_PARSER_TEMPLATE.substitute(
+            lexer_prefix=lexer_prefix,
+            parser_prefix=parser_prefix,
+            parser_upper=parser_prefix.upper(),
+            min_buffer=min_buffer,
+            function_name=function_name,
+        )
     )
 
 
@@ -409,8 +617,7 @@ class Severity(Enum):
     INFO = "INFO"
 
 
-@dataclass
-class ValidationIssue:
+class ValidationIssue(NamedTuple):
     """A validation issue found in lexer or parser."""
 
     severity: Severity
@@ -422,17 +629,19 @@ class ValidationIssue:
 class LexerValidator:
     """Validates Flex lexer file for streaming compatibility."""
 
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, source: Optional[bytes] = None):
         self.filename = filename
+        self.source = source
         self.issues: List[ValidationIssue] = []
         self.options: dict[str, bool] = {}
         self.has_yy_input = False
         self.yy_input_calls_fsp = False
+        self.bad_yy_input_lines: List[int] = []
 
     def validate(self) -> List[ValidationIssue]:
         """Validate lexer file."""
         try:
-            with open(self.filename, "r") as f:
+            with _open_text(self.filename, self.source) as f:
                 lines = f.readlines()
         except FileNotFoundError:
             self.issues.append(
@@ -444,23 +653,48 @@ class LexerValidator:
             )
             return self.issues
 
-        self._check_options(lines)
-        self._check_yy_input(lines)
+        self._scan_lines(lines)
+        self._check_options()
+        self._check_yy_input()
 
         return self.issues
 
-    def _check_options(self, lines: List[str]) -> None:
-        """Check for required Flex options."""
-        for line in lines:
-            line = line.strip()
-            if line.startswith("%option"):
-                options_str = line[7:].strip()
-                for opt in options_str.split():
-                    if opt.startswith("no"):
+    def _scan_lines(self, lines: List[str]) -> None:
+        """Collect %option settings and YY_INPUT definitions in one pass."""
+        in_definition = False
+        definition_lines: List[str] = []
+        definition_start_line = 0
+
+        for line_num, line in enumerate(lines, start=1):
+            stripped = line.strip()
+            if stripped.startswith("%option"):
+                # First token is the %option keyword itself
+                for opt in stripped.split()[1:]:
+                    if opt[:2] == "no":
                         self.options[opt[2:]] = False
                     else:
                         self.options[opt] = True
 
+            # Cheap substring test before running the regex
+            if "YY_INPUT" in line and _YY_INPUT_RE.search(line):
+                self.has_yy_input = True
+                in_definition = True
+                definition_start_line = line_num
+                definition_lines = [line]
+                continue
+
+            if in_definition:
+                definition_lines.append(line)
+                if not line.rstrip().endswith("\\"):
+                    in_definition = False
+                    full_definition = "".join(definition_lines)
+                    if "fsp_read_input" in full_definition:
+                        self.yy_input_calls_fsp = True
+                    else:
+                        self.bad_yy_input_lines.append(definition_start_line)
+
+    def _check_options(self) -> None:
+        """Check for required Flex options."""
         required_options = {
             "reentrant": "Required for push parser integration",
             "bison-bridge": "Required for passing yylval to parser",
@@ -476,36 +710,17 @@ class LexerValidator:
                     )
                 )
 
-    def _check_yy_input(self, lines: List[str]) -> None:
+    def _check_yy_input(self) -> None:
         """Check for YY_INPUT macro definition."""
-        in_definition = False
-        definition_lines = []
-        definition_start_line = 0
-
-        for line_num, line in enumerate(lines, start=1):
-            if re.search(r"#\s*define\s+YY_INPUT", line):
-                self.has_yy_input = True
-                in_definition = True
-                definition_start_line = line_num
-                definition_lines = [line]
-                continue
-
-            if in_definition:
-                definition_lines.append(line)
-                if not line.rstrip().endswith("\\"):
-                    in_definition = False
-                    full_definition = "".join(definition_lines)
-                    if "fsp_read_input" in full_definition:
-                        self.yy_input_calls_fsp = True
-                    else:
-                        self.issues.append(
-                            ValidationIssue(
-                                severity=Severity.ERROR,
-                                message="YY_INPUT is defined but does not call fsp_read_input()",
-                                file=self.filename,
-                                line_number=definition_start_line,
-                            )
-                        )
+        for definition_start_line in self.bad_yy_input_lines:
+            self.issues.append(
+                ValidationIssue(
+                    severity=Severity.ERROR,
+                    message="YY_INPUT is defined but does not call fsp_read_input()",
+                    file=self.filename,
+                    line_number=definition_start_line,
+                )
+            )
 
         if not self.has_yy_input:
             self.issues.append(
@@ -520,15 +735,16 @@ class LexerValidator:
 class ParserValidator:
     """Validates Bison parser file for streaming compatibility."""
 
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, source: Optional[bytes] = None):
         self.filename = filename
+        self.source = source
         self.issues: List[ValidationIssue] = []
         self.api_settings: dict[str, str] = {}
 
     def validate(self) -> List[ValidationIssue]:
         """Validate parser file."""
         try:
-            with open(self.filename, "r") as f:
+            with _open_text(self.filename, self.source) as f:
                 lines = f.readlines()
         except FileNotFoundError:
             self.issues.append(
@@ -548,7 +764,9 @@ class ParserValidator:
         """Check for %define api.* directives."""
         for line in lines:
             line = line.strip()
-            match = re.match(r"%define\s+api\.([a-z\-\.]+)\s+(.+)", line)
+            if not line.startswith("%define"):
+                continue
+            match = _API_DEFINE_RE.match(line)
             if match:
                 api_key = match.group(1)
                 api_value = match.group(2).strip()
@@ -592,58 +810,490 @@ class ParserValidator:
             )
 
 
-def print_issues(issues: List[ValidationIssue], strict: bool = False) -> int:
-    """Print validation issues and return exit code."""
-    if not issues:
-        print("✓ All checks passed")
-        return 0
+def issues_exit_code(errors: int, warnings: int, strict: bool = False) -> int:
+    """Return the exit code for issue counts: 1 for errors (or warnings if strict), 2 for warnings, else 0."""
+    if errors or (warnings and strict):
+        return 1
+    if warnings:
+        return 2
+    return 0
 
-    errors = [i for i in issues if i.severity == Severity.ERROR]
-    warnings = [i for i in issues if i.severity == Severity.WARNING]
-    infos = [i for i in issues if i.severity == Severity.INFO]
 
-    for issue in errors:
-        location = issue.file
-        if issue.line_number:
-            location += f":{issue.line_number}"
-        print(f"{location}: ERROR: {issue.message}", file=sys.stderr)
+def print_issues(issues: Iterable[ValidationIssue], strict: bool = False) -> int:
+    """
+    Print validation issues and return exit code.
 
-    for issue in warnings:
-        location = issue.file
-        if issue.line_number:
-            location += f":{issue.line_number}"
-        severity_str = "ERROR" if strict else "WARNING"
-        stream = sys.stderr if strict else sys.stdout
-        print(f"{location}: {severity_str}: {issue.message}", file=stream)
+    issues may be any iterable, such as a chain of several validators'
+    results; it is consumed exactly once.
+    """
+    # Format every issue in one pass, then emit each stream with one write
+    errors: List[str] = []
+    warnings: List[str] = []
+    infos: List[str] = []
+    warning_label = "ERROR" if strict else "WARNING"
 
-    for issue in infos:
+    for issue in issues:
         location = issue.file
         if issue.line_number:
             location += f":{issue.line_number}"
-        print(f"{location}: INFO: {issue.message}")
+        if issue.severity == Severity.ERROR:
+            errors.append(f"{location}: ERROR: {issue.message}\n")
+        elif issue.severity == Severity.WARNING:
+            warnings.append(f"{location}: {warning_label}: {issue.message}\n")
+        elif issue.severity == Severity.INFO:
+            infos.append(f"{location}: INFO: {issue.message}\n")
+
+    if not (errors or warnings or infos):
+        print("✓ All checks passed")
+        return 0
+
+    if strict:
+        err_lines = errors + warnings
+        out_lines = infos + ["\n"]
+    else:
+        err_lines = errors
+        out_lines = warnings + infos + ["\n"]
+
+    sys.stderr.write("".join(err_lines))
+    sys.stdout.write("".join(out_lines))
 
-    print()
     if errors:
         print(f"✗ {len(errors)} error(s) found - streaming will NOT work", file=sys.stderr)
-        return 1
     elif warnings and strict:
         print(f"✗ {len(warnings)} warning(s) found (treated as errors in strict mode)", file=sys.stderr)
-        return 1
     elif warnings:
         print(f"⚠ {len(warnings)} warning(s) found - streaming may work but configuration is incomplete")
-        return 2
     else:
         print(f"✓ {len(infos)} informational note(s)")
-        return 0
+    return issues_exit_code(len(errors), len(warnings), strict)
+
+
+def cached_min_buffer(filename: str, cache: Optional[ResultCache]) -> int:
+    """Quietly calculate MIN_BUFFER_FOR_LEX, reusing a cached value if the lexer is unchanged."""
+    stamp = cache.stamp(filename) if cache else None
+    if cache and stamp:
+        value = cache.get("min_buffer", filename, stamp)
+        if isinstance(value, int):
+            return value
+
+    value = calculate_min_buffer(filename, quiet=True)
+    if cache and stamp:
+        cache.put("min_buffer", filename, stamp, value)
+    return value
+
+
+def cached_issues(
+    kind: str,
+    filename: str,
+    cache: Optional[ResultCache],
+    validate: Callable[[], List[ValidationIssue]],
+    stamp: Optional[List[int]] = None,
+) -> List[ValidationIssue]:
+    """
+    Run validate() for filename, reusing cached issues if the file is unchanged.
+
+    If filename has already been read for validate(), pass the stamp
+    taken before that read, so a file saved in between is not cached
+    under its new stamp.
+    """
+    if cache and stamp is None:
+        stamp = cache.stamp(filename)
+    if cache and stamp:
+        value = cache.get(kind, filename, stamp)
+        if isinstance(value, list):
+            # Issues always name the validated file, which is re-attached
+            # here so cached results follow the path the user gave.  A
+            # malformed entry is treated as a miss.
+            try:
+                return [
+                    ValidationIssue(Severity(sev), message, filename, line) for sev, message, line in value
+                ]
+            except (TypeError, ValueError):
+                pass
+
+    issues = validate()
+    if cache and stamp:
+        cache.put(kind, filename, stamp, [[i.severity.value, i.message, i.line_number] for i in issues])
+    return issues
+
+
+class AnalysisResult(NamedTuple):
+    """Combined result of calculating and validating a lexer/parser pair."""
+
+    min_buffer: Optional[int]
+    issues: List[ValidationIssue]
+
+
+def analyze(
+    lexer: Optional[str] = None,
+    parser: Optional[str] = None,
+    want_min_buffer: bool = False,
+    report: bool = False,
+    cache: Optional[ResultCache] = None,
+    jobs: int = 1,
+) -> AnalysisResult:
+    """
+    Calculate MIN_BUFFER_FOR_LEX and validate a lexer/parser pair.
+
+    The lexer is read once and shared by the calculation and the
+    lexer validation.
+
+    Args:
+        lexer: Path to .l file, or None
+        parser: Path to .y file, or None
+        want_min_buffer: Calculate MIN_BUFFER_FOR_LEX from the lexer
+        report: Print the MIN_BUFFER_FOR_LEX analysis report
+        cache: Cache for validation issues, or None
+        jobs: With 2 or more, validate the parser in a worker thread
+              while the lexer is processed
+
+    Returns:
+        AnalysisResult with min_buffer (None if not calculated) and issues
+    """
+    issues: List[ValidationIssue] = []
+    min_buffer = None
+
+    executor = None
+    parser_future = None
+    if lexer and parser and jobs > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        parser_future = executor.submit(
+            cached_issues, "parser", parser, cache, ParserValidator(parser).validate
+        )
+
+    try:
+        if lexer:
+            lexer_source = None
+            lexer_stamp = None
+            if want_min_buffer:
+                lexer_stamp = cache.stamp(lexer) if cache else None
+                try:
+                    lexer_source = _read_source(lexer)
+                except FileNotFoundError:
+                    # Reported as an issue by the validator below
+                    pass
+            if lexer_source is not None:
+                min_buffer = calculate_min_buffer(lexer, quiet=not report, source=lexer_source)
+            lexer_validator = LexerValidator(lexer, source=lexer_source)
+            issues.extend(cached_issues("lexer", lexer, cache, lexer_validator.validate, lexer_stamp))
+
+        # Parser issues always follow lexer issues, however they were run
+        if parser_future:
+            issues.extend(parser_future.result())
+        elif parser:
+            parser_validator = ParserValidator(parser)
+            issues.extend(cached_issues("parser", parser, cache, parser_validator.validate))
+    finally:
+        if executor:
+            executor.shutdown()
+
+    return AnalysisResult(min_buffer, issues)
+
+
+# ========================================================================
+# BATCH: Checking many lexer/parser pairs in one process
+# ========================================================================
+
+
+def read_manifest(stream: TextIO) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Read a batch manifest.
+
+    Each non-blank line not starting with '#' is 'lexer[,parser]'; either
+    side may be empty to check only the other file.
+
+    Args:
+        stream: Manifest text stream
+
+    Returns:
+        List of (lexer, parser) pairs with None for an omitted file
+    """
+    entries: List[Tuple[Optional[str], Optional[str]]] = []
+    for line in stream:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        lexer, _, parser = line.partition(",")
+        entries.append((lexer.strip() or None, parser.strip() or None))
+    return entries
+
+
+def check_entry(lexer: Optional[str], parser: Optional[str], strict: bool = False) -> Dict[str, Any]:
+    """
+    Calculate MIN_BUFFER_FOR_LEX and validate one manifest entry.
+
+    Args:
+        lexer: Path to .l file, or None
+        parser: Path to .y file, or None
+        strict: Treat warnings as errors for the status
+
+    Returns:
+        JSON-serializable result with min_buffer, status and issues
+    """
+    issues: List[ValidationIssue] = []
+    min_buffer = None
+
+    # Check each file separately so an unreadable one is reported as an
+    # error for this entry instead of aborting the whole batch
+    for filename, is_lexer in ((lexer, True), (parser, False)):
+        if not filename:
+            continue
+        try:
+            if is_lexer:
+                result = analyze(lexer=filename, want_min_buffer=True)
+                min_buffer = result.min_buffer
+            else:
+                result = analyze(parser=filename)
+            issues.extend(result.issues)
+        except (OSError, UnicodeDecodeError) as e:
+            issues.append(
+                ValidationIssue(
+                    severity=Severity.ERROR,
+                    message=f"Cannot read file: {e}",
+                    file=filename,
+                )
+            )
+
+    severities = [i.severity for i in issues]
+    return {
+        "lexer": lexer,
+        "parser": parser,
+        "min_buffer": min_buffer,
+        "status": issues_exit_code(
+            severities.count(Severity.ERROR), severities.count(Severity.WARNING), strict
+        ),
+        "issues": [
+            {"severity": i.severity.value, "message": i.message, "file": i.file, "line": i.line_number}
+            for i in issues
+        ],
+    }
+
+
+def run_batch(
+    entries: List[Tuple[Optional[str], Optional[str]]],
+    output: TextIO,
+    jobs: int = 1,
+    strict: bool = False,
+) -> int:
+    """
+    Check every manifest entry, writing one JSON line per entry in manifest order.
+
+    Args:
+        entries: (lexer, parser) pairs from read_manifest()
+        output: Output stream for JSON lines
+        jobs: Worker processes to use; 1 checks entries in this process
+        strict: Treat warnings as errors
+
+    Returns:
+        Worst entry status: 1 if any entry failed, else 2 if any warned, else 0
+    """
+    import json
+
+    if jobs > 1 and len(entries) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(
+                executor.map(
+                    check_entry,
+                    [lexer for lexer, _ in entries],
+                    [parser for _, parser in entries],
+                    [strict] * len(entries),
+                )
+            )
+    else:
+        results = [check_entry(lexer, parser, strict) for lexer, parser in entries]
+
+    statuses = set()
+    for result in results:
+        output.write(json.dumps(result) + "\n")
+        statuses.add(result["status"])
+
+    if 1 in statuses:
+        return 1
+    return 2 if 2 in statuses else 0
 
 
 # ========================================================================
 # MAIN
 # ========================================================================
 
+# Section banners for the check command, each emitted with a single write
+_BAR = "=" * 70
+_STEP1_HEADER = f"{_BAR}\nSTEP 1: Calculate MIN_BUFFER_FOR_LEX\n{_BAR}\n"
+_STEP2_HEADER = f"\n{_BAR}\nSTEP 2: Validate Configuration\n{_BAR}\n"
+_SUMMARY_HEADER = f"\n{_BAR}\nSUMMARY\n{_BAR}\n"
+
+
+@contextlib.contextmanager
+def open_output(path: Optional[str]) -> Iterator[TextIO]:
+    """
+    Open an output file lazily and atomically.
+
+    Yields stdout if path is None or '-'. A missing path or a regular,
+    non-symlink file is written via a buffered temporary file in the
+    same directory that replaces path, keeping its mode, only when the
+    block completes, so a failed or interrupted run never truncates it.
+    Anything else (symlinks, devices, FIFOs), or a path whose directory
+    does not allow creating the temporary file, is opened and written
+    directly.
+    """
+    if not path or path == "-":
+        yield sys.stdout
+        return
+
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        st = None
+    if st is not None and not stat.S_ISREG(st.st_mode):
+        with open(path, "w", buffering=1 << 20, encoding="utf-8") as f:
+            yield f
+        return
+
+    import shutil
+    import tempfile
+
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path) or ".", prefix=".fsp-helper-", suffix=".tmp"
+        )
+    except OSError:
+        # Any error opening path itself is then reported against path
+        with open(path, "w", buffering=1 << 20, encoding="utf-8") as f:
+            yield f
+        return
+
+    try:
+        with open(fd, "w", buffering=1 << 20, encoding="utf-8") as f:
+            yield f
+        if st is not None:
+            shutil.copymode(path, tmp_path)
+        else:
+            # mkstemp creates 0600; use the mode a plain open() would give
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _write_error(path: Optional[str], e: OSError) -> int:
+    """Report that an output file could not be written and return the exit code."""
+    print(f"Error: Cannot write {path or 'stdout'}: {e.strerror or e}", file=sys.stderr)
+    return 1
+
+
+def _cache_for(args: "argparse.Namespace") -> Optional[ResultCache]:
+    """Return the result cache for a command, or None if --no-cache was given."""
+    return None if args.no_cache else ResultCache()
+
+
+def _cmd_calculate(args: "argparse.Namespace") -> int:
+    """Handle the calculate command."""
+    if args.quiet:
+        cache = _cache_for(args)
+        print(cached_min_buffer(args.lexer_file, cache))
+        if cache:
+            cache.save()
+    else:
+        calculate_min_buffer(args.lexer_file, verbose=args.verbose)
+    return 0
+
+
+def _cmd_generate(args: "argparse.Namespace") -> int:
+    """Handle the generate command."""
+    function_name = args.function_name or f"{args.lexer_prefix}_streaming_parse"
+    try:
+        with open_output(args.output) as output:
+            generate_streaming_parser(
+                lexer_prefix=args.lexer_prefix,
+                parser_prefix=args.parser_prefix,
+                min_buffer=args.min_buffer,
+                function_name=function_name,
+                output=output,
+            )
+    except OSError as e:
+        return _write_error(args.output, e)
+    return 0
+
+
+def _cmd_validate(args: "argparse.Namespace") -> int:
+    """Handle the validate command."""
+    if not args.lexer and not args.parser:
+        print("Error: Must specify --lexer, --parser, or both", file=sys.stderr)
+        return 1
+
+    cache = _cache_for(args)
+    analysis = analyze(args.lexer, args.parser, cache=cache, jobs=args.jobs)
+    if cache:
+        cache.save()
+
+    return print_issues(analysis.issues, strict=args.strict)
+
+
+def _cmd_check(args: "argparse.Namespace") -> int:
+    """Handle the check command (calculate + validate)."""
+    sys.stdout.write(_STEP1_HEADER)
+    cache = _cache_for(args)
+    analysis = analyze(
+        args.lexer, args.parser, want_min_buffer=True, report=True, cache=cache, jobs=args.jobs
+    )
+    if cache:
+        cache.save()
+
+    sys.stdout.write(_STEP2_HEADER)
+
+    result = print_issues(analysis.issues, strict=args.strict)
+
+    if result == 0:
+        sys.stdout.write(_SUMMARY_HEADER)
+        print(f"✓ Configuration is correct for streaming")
+        print(f"✓ Recommended MIN_BUFFER_FOR_LEX: {analysis.min_buffer}")
+
+    return result
+
+
+def _cmd_batch(args: "argparse.Namespace") -> int:
+    """Handle the batch command."""
+    if args.manifest == "-":
+        entries = read_manifest(sys.stdin)
+    else:
+        try:
+            with open(args.manifest, "r", encoding="utf-8") as f:
+                entries = read_manifest(f)
+        except OSError as e:
+            print(f"Error: Cannot read {args.manifest}: {e.strerror or e}", file=sys.stderr)
+            return 1
+    try:
+        with open_output(args.output) as output:
+            return run_batch(entries, output, jobs=args.jobs, strict=args.strict)
+    except OSError as e:
+        return _write_error(args.output, e)
+
 
 def main() -> int:
     """Main entry point."""
+    # Fast path for the common build-system call 'calc -q FILE': skip
+    # importing and building the argparse parser
+    argv = sys.argv[1:]
+    if (
+        len(argv) == 3
+        and argv[0] in ("calculate", "calc")
+        and argv[1] in ("-q", "--quiet")
+        and not argv[2].startswith("-")
+    ):
+        cache = ResultCache()
+        print(cached_min_buffer(argv[2], cache))
+        cache.save()
+        return 0
+
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="libfsp helper - Calculate, generate, and validate streaming parsers",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -656,6 +1306,8 @@ def main() -> int:
     calc.add_argument("lexer_file", help="Flex lexer file (.l)")
     calc.add_argument("-v", "--verbose", action="store_true", help="Show detailed analysis")
     calc.add_argument("-q", "--quiet", action="store_true", help="Only output the number")
+    calc.add_argument("--no-cache", action="store_true", help="Do not use cached results")
+    calc.set_defaults(handler=_cmd_calculate)
 
     # Generate subcommand
     gen = subparsers.add_parser("generate", aliases=["gen"], help="Generate streaming parser implementation")
@@ -665,19 +1317,43 @@ def main() -> int:
     gen.add_argument(
         "--function-name", help="Generated function name (default: {lexer_prefix}_streaming_parse)"
     )
-    gen.add_argument("-o", "--output", type=argparse.FileType("w"), default=sys.stdout, help="Output file")
+    gen.add_argument("-o", "--output", help="Output file (default: stdout)")
+    gen.set_defaults(handler=_cmd_generate)
 
     # Validate subcommand
     val = subparsers.add_parser("validate", aliases=["val"], help="Validate lexer/parser configuration")
     val.add_argument("--lexer", "-l", help="Flex lexer file (.l)")
     val.add_argument("--parser", "-p", help="Bison parser file (.y)")
     val.add_argument("--strict", "-s", action="store_true", help="Treat warnings as errors")
+    val.add_argument("--no-cache", action="store_true", help="Do not use cached results")
+    val.add_argument(
+        "--jobs", "-j", type=int, default=1, help="Validate lexer and parser concurrently if 2 or more"
+    )
+    val.set_defaults(handler=_cmd_validate)
 
     # Check subcommand (calculate + validate)
     check = subparsers.add_parser("check", help="Calculate MIN_BUFFER and validate configuration")
     check.add_argument("--lexer", "-l", required=True, help="Flex lexer file (.l)")
     check.add_argument("--parser", "-p", help="Bison parser file (.y)")
     check.add_argument("--strict", "-s", action="store_true", help="Treat warnings as errors")
+    check.add_argument("--no-cache", action="store_true", help="Do not use cached results")
+    check.add_argument(
+        "--jobs", "-j", type=int, default=1, help="Validate lexer and parser concurrently if 2 or more"
+    )
+    check.set_defaults(handler=_cmd_check)
+
+    # Batch subcommand (check many lexer/parser pairs in one process)
+    batch = subparsers.add_parser("batch", help="Check many lexer/parser pairs listed in a manifest")
+    batch.add_argument(
+        "--manifest",
+        "-m",
+        default="-",
+        help="Manifest file, or '-' for stdin (default: stdin)",
+    )
+    batch.add_argument("--jobs", "-j", type=int, default=1, help="Worker processes (default: 1)")
+    batch.add_argument("--strict", "-s", action="store_true", help="Treat warnings as errors")
+    batch.add_argument("-o", "--output", help="Output file (default: stdout)")
+    batch.set_defaults(handler=_cmd_batch)
 
     args = parser.parse_args()
 
@@ -685,74 +1361,9 @@ def main() -> int:
         parser.print_help()
         return 1
 
-    # Calculate
-    if args.command in ["calculate", "calc"]:
-        calculate_min_buffer(args.lexer_file, verbose=args.verbose, quiet=args.quiet)
-        return 0
-
-    # Generate
-    elif args.command in ["generate", "gen"]:
-        function_name = args.function_name or f"{args.lexer_prefix}_streaming_parse"
-        generate_streaming_parser(
-            lexer_prefix=args.lexer_prefix,
-            parser_prefix=args.parser_prefix,
-            min_buffer=args.min_buffer,
-            function_name=function_name,
-            output=args.output,
-        )
-        if args.output != sys.stdout:
-            args.output.close()
-        return 0
-
-    # Validate
-    elif args.command in ["validate", "val"]:
-        if not args.lexer and not args.parser:
-            print("Error: Must specify --lexer, --parser, or both", file=sys.stderr)
-            return 1
-
-        all_issues = []
-        if args.lexer:
-            lexer_validator = LexerValidator(args.lexer)
-            all_issues.extend(lexer_validator.validate())
-        if args.parser:
-            parser_validator = ParserValidator(args.parser)
-            all_issues.extend(parser_validator.validate())
-
-        return print_issues(all_issues, strict=args.strict)
-
-    # Check (calculate + validate)
-    elif args.command == "check":
-        print("=" * 70)
-        print("STEP 1: Calculate MIN_BUFFER_FOR_LEX")
-        print("=" * 70)
-        min_buffer = calculate_min_buffer(args.lexer, verbose=False, quiet=False)
-
-        print()
-        print("=" * 70)
-        print("STEP 2: Validate Configuration")
-        print("=" * 70)
-
-        all_issues = []
-        lexer_validator = LexerValidator(args.lexer)
-        all_issues.extend(lexer_validator.validate())
-
-        if args.parser:
-            parser_validator = ParserValidator(args.parser)
-            all_issues.extend(parser_validator.validate())
-
-        result = print_issues(all_issues, strict=args.strict)
-
-        if result == 0:
-            print()
-            print("=" * 70)
-            print("SUMMARY")
-            print("=" * 70)
-            print(f"✓ Configuration is correct for streaming")
-            print(f"✓ Recommended MIN_BUFFER_FOR_LEX: {min_buffer}")
-
-        return result
-
-    return 1
+    # Each subcommand registers its handler with set_defaults(handler=...)
+    result: int = args.handler(args)
+    return result
 
 
 if __name__ == "__main__":